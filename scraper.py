@@ -7,87 +7,295 @@ translates it via Claude API, and updates an RSS feed.
 """
 
 import os
+import atexit
+import sys
 import re
-import json
 import hashlib
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
-from anthropic import Anthropic
-from feedgen.feed import FeedGenerator
+import httpx
+import orjson
+from lxml import etree
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
+from selectolax.lexbor import LexborHTMLParser
+from anthropic import Anthropic, APIConnectionError, APIStatusError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 
 # Configuration
 ESSAY_URL = "https://www.1101.com/"
 OUTPUT_DIR = Path(__file__).parent / "docs"
 FEED_FILE = OUTPUT_DIR / "feed.xml"
-ARCHIVE_FILE = OUTPUT_DIR / "archive.json"
+ARCHIVE_FILE = OUTPUT_DIR / "archive.jsonl"
+HASHES_FILE = OUTPUT_DIR / "hashes.txt"
+VALIDATORS_FILE = OUTPUT_DIR / "homepage_validators.json"  # ETag/Last-Modified of the last processed fetch
+ARCHIVE_LIMIT = 60  # Entries kept in ARCHIVE_FILE; older ones move to yearly shards
+INTERNED_FIELDS = ('author', 'translated_author')  # Archive values shared across entries
 DARLING_IMAGE_URL = "https://www.1101.com/home/2025/images/home/darling.png"
 HOBONICHI_ICON_URL = "https://adtheriault.github.io/itoi-daily/hobonichi%20logo.png"
+FEED_LIMIT = 30  # Entries shown in the feed
+
+# Atom feed namespaces, with Clark-notation prefixes for building elements
+FEED_NSMAP = {
+    None: "http://www.w3.org/2005/Atom",
+    'media': "http://search.yahoo.com/mrss/",
+    'thr': "http://purl.org/syndication/thread/1.0",
+}
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+
+# Centered header image prepended to each entry's content
+IMAGE_HTML = f'<div style="text-align: center; margin-bottom: 20px;"><img src="{DARLING_IMAGE_URL}" alt="Hobonichi Darling" style="max-width: 300px; height: auto;"/></div>'
+JST = timezone(timedelta(hours=9))
+ESSAY_UPDATE_HOUR = 11  # 1101.com posts the new essay at 11 AM JST
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; itoi-daily/1.0; +https://adtheriault.github.io/itoi-daily/)',
+    'Accept-Language': 'ja,en;q=0.9',
+}
+
+# Itoi's byline, which any block holding the essay will contain
+ITOI_BYLINE = "糸井重里"
+_ITOI_BYLINE_BYTES = ITOI_BYLINE.encode()
+
+# Candidate essay containers for the Strategy 2 fallback, narrowest first
+FALLBACK_SELECTORS = (
+    'main div, article, section.darling, div.darling',
+    'div, section, article',
+)
+
+# Essay title inside the Alpine.js x-data attribute on div.darling
+_DARLING_TITLE_RE = re.compile(r"darlingTitle:\s*`(.*?)`")
+
+# Footer lines about update times that trail the essay text
+FOOTER_MARKER = "ほぼ日の更新時間"
+_FOOTER_LINE_RE = re.compile(rf'^.*{re.escape(FOOTER_MARKER)}.*$\n?', re.M)
+
+# Output budget for the title, author, HTML body, and summary together
+TRANSLATION_MAX_TOKENS = 8192
+
+# Structured output schema for translate_essay
+TRANSLATION_TOOL = {
+    "name": "record_translation",
+    "description": "Record the English translation of the essay's title, author name, and body, and its summary.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "translated_title": {"type": "string", "description": "The essay title in natural English"},
+            "translated_author": {"type": "string", "description": "The author's name in English"},
+            "translation": {"type": "string", "description": "The essay body as <p> tags, one per paragraph"},
+            "summary": {"type": "string", "description": "A 1-2 sentence summary of the essay"},
+        },
+        "required": ["translated_title", "translated_author", "translation", "summary"],
+    },
+}
+
+# Shared HTTP/2 session for 1101.com, so any further requests reuse the connection.
+# Failed connection attempts are retried before falling back to Playwright.
+_HTTP = httpx.Client(
+    transport=httpx.HTTPTransport(http2=True, retries=2),
+    headers=REQUEST_HEADERS,
+    timeout=30.0,
+    follow_redirects=True,
+)
+
+# Headless Chromium for the Playwright fallback, launched on first use and
+# kept for the rest of the process
+_BROWSER = None
+
+# Shared Claude client, created on first use so its connection pool is reused
+_CLIENT: Optional[Anthropic] = None
+
+
+def _client() -> Anthropic:
+    """Return the shared Claude client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        # Retries are handled by _claude_retry, so disable the SDK's own
+        _CLIENT = Anthropic(api_key=api_key, max_retries=0)
+    return _CLIENT
+
+
+_BACKOFF = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_for_retry(retry_state) -> float:
+    """Wait as long as the API's retry-after header asks, else back off exponentially."""
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    if response is not None:
+        try:
+            return min(float(response.headers['retry-after']), 60.0)
+        except (KeyError, ValueError):
+            pass
+    return _BACKOFF(retry_state)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Return whether a Claude API error is worth retrying.
+
+    Matches the SDK's own rule: dropped connections and timeouts, plus
+    408, 409, 429, and any 5xx (including 529 overloaded).
+    """
+    if isinstance(exc, APIConnectionError):
+        return True
+    return isinstance(exc, APIStatusError) and (exc.status_code in (408, 409, 429) or exc.status_code >= 500)
+
+
+# Retry transient Claude failures instead of losing the day's essay to a
+# single bad response
+_claude_retry = retry(
+    wait=_wait_for_retry,
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception(_is_transient),
+    reraise=True,
+)
+
+
+def fetch_homepage(validators: dict) -> Optional[httpx.Response]:
+    """Fetch the 1101.com homepage as served, without running any JavaScript.
+
+    The request is conditional on the validators saved by the last processed
+    run, so an unchanged page comes back as an empty 304 response.
+    """
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    try:
+        response = _HTTP.get(ESSAY_URL, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"Plain fetch failed: {e}")
+        return None
+
+    return response
+
+
+def load_validators() -> dict:
+    """Load the homepage's ETag/Last-Modified from the last processed run."""
+    if VALIDATORS_FILE.exists():
+        return orjson.loads(VALIDATORS_FILE.read_bytes())
+    return {}
+
+
+def save_validators(response: Optional[httpx.Response]):
+    """Remember the homepage's ETag/Last-Modified for the next conditional fetch.
+
+    Pass None when the essay did not come from the fetched HTML (it had to be
+    rendered with Playwright): static markup that is unchanged says nothing
+    about the essay, so any saved validators are dropped instead.
+    """
+    if response is None:
+        VALIDATORS_FILE.unlink(missing_ok=True)
+        return
+    validators = {
+        'etag': response.headers.get('etag'),
+        'last_modified': response.headers.get('last-modified'),
+    }
+    write_atomic(VALIDATORS_FILE, orjson.dumps({k: v for k, v in validators.items() if v}))
+
+
+def _browser():
+    """Return the shared headless Chromium, launching it on first use."""
+    global _BROWSER
+    if _BROWSER is None:
+        playwright = sync_playwright().start()
+        _BROWSER = playwright.chromium.launch(headless=True)
+        atexit.register(_close_browser, playwright)
+    return _BROWSER
+
 
+def _close_browser(playwright):
+    """Shut down the shared Chromium and its Playwright driver at exit."""
+    _BROWSER.close()
+    playwright.stop()
 
-def scrape_essay() -> Optional[dict]:
-    """Fetch and extract Itoi's daily essay from 1101.com using Playwright."""
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+def render_html() -> bytes:
+    """Render the 1101.com homepage in headless Chromium using Playwright."""
+    page = _browser().new_page()
+    try:
         page.goto(ESSAY_URL)
-        page.wait_for_timeout(2000)  # Wait for JS to render
+        try:
+            # Wait for the essay to render rather than for a fixed delay
+            page.wait_for_selector("div.darling-text", timeout=5000)
+        except PlaywrightTimeoutError:
+            pass  # Take what rendered; parse_essay has its own fallback
+        return page.content().encode()
+    finally:
+        page.close()
+
+
+def join_paragraphs(container) -> str:
+    """Join the text of a node's <p> paragraphs with blank lines.
+
+    Each <p> tag is a true paragraph. <br> tags within are soft line breaks
+    (common in Japanese essays for visual formatting), so they become spaces
+    and whitespace inside each paragraph is collapsed.
+    """
+    for br in container.css('p br'):
+        br.replace_with(' ')
+    texts = (' '.join(p.text().split()) for p in container.css('p'))
+    return '\n\n'.join(filter(None, texts))
+
+
+def find_essay_section(tree):
+    """Find the first block that looks like the essay: bylined, long, with <p>s.
+
+    Likely containers are checked first; every div/section/article is only
+    scanned if none of them match, skipping the ones already rejected.
+    """
+    seen = set()
+    for selector in FALLBACK_SELECTORS:
+        for section in tree.css(selector):
+            if section.mem_id in seen:
+                continue
+            seen.add(section.mem_id)
+            text = section.text()
+            if ITOI_BYLINE in text and len(text) > 500 and section.css_first('p'):
+                return section
+    return None
 
-        html = page.content()
-        browser.close()
 
-    soup = BeautifulSoup(html, 'html.parser')
+def parse_essay(html: bytes) -> tuple:
+    """Extract the essay's (title, author, body) from 1101.com homepage HTML."""
+    tree = LexborHTMLParser(html)
 
-    title = None
-    author = None
     body = None
 
     # Strategy 1: Use specific selectors (like hellodarling)
-    title_el = soup.select_one("div.darling-title h2")
-    author_el = soup.select_one("div.darling-title h3")
-    body_el = soup.select_one("div.darling-text")
+    title_el = tree.css_first("div.darling-title h2")
+    author_el = tree.css_first("div.darling-title h3")
+    body_el = tree.css_first("div.darling-text")
 
-    if title_el and title_el.get_text(strip=True):
-        title = title_el.get_text(strip=True)
-    else:
+    title = title_el.text(strip=True) if title_el else None
+    if not title:
         # Fallback: extract title from x-data attribute
-        darling_div = soup.select_one("div.darling")
-        if darling_div and darling_div.has_attr("x-data"):
-            match = re.search(r"darlingTitle:\s*`(.*?)`", darling_div["x-data"])
+        darling_div = tree.css_first("div.darling")
+        x_data = darling_div.attributes.get("x-data") if darling_div else None
+        if x_data:
+            match = _DARLING_TITLE_RE.search(x_data)
             if match:
                 title = match.group(1)
 
-    if author_el and author_el.get_text(strip=True):
-        author = author_el.get_text(strip=True)
+    author = author_el.text(strip=True) if author_el else None
 
     if body_el:
-        # Get all paragraphs from the body
-        paragraphs = body_el.find_all('p')
-        if paragraphs:
-            # Each <p> tag is a true paragraph
-            # <br> tags within are soft line breaks (common in Japanese essays for visual formatting)
-            all_paragraphs = []
-            for p in paragraphs:
-                # Replace <br> tags with space - they're soft breaks within a paragraph
-                for br in p.find_all('br'):
-                    br.replace_with(' ')
-                text = p.get_text()
-                # Clean up multiple spaces and normalize whitespace
-                text = ' '.join(text.split())
-                if text:
-                    all_paragraphs.append(text)
-            body = '\n\n'.join(all_paragraphs)
+        if body_el.css_first('p'):
+            body = join_paragraphs(body_el)
         else:
             # No <p> tags - use blank lines as paragraph separators
             # <br> tags are soft line breaks within paragraphs
-            for br in body_el.find_all('br'):
+            for br in body_el.css('br'):
                 br.replace_with(' ')
-            body = body_el.get_text()
+            body = body_el.text()
             # Normalize: collapse whitespace within paragraphs
             lines = body.split('\n')
             paragraphs = []
@@ -103,89 +311,83 @@ def scrape_essay() -> Optional[dict]:
                 paragraphs.append(' '.join(current_para))
             body = '\n\n'.join(paragraphs)
 
-    # Strategy 2: Fallback to broader search if specific selectors fail
-    if not body:
-        for section in soup.find_all(['div', 'section', 'article']):
-            text = section.get_text()
-            if '糸井重里' in text and len(text) > 500:
-                paragraphs = section.find_all('p')
-                if paragraphs:
-                    # Each <p> tag is a true paragraph
-                    # <br> tags within are soft line breaks
-                    all_paragraphs = []
-                    for p in paragraphs:
-                        for br in p.find_all('br'):
-                            br.replace_with(' ')
-                        p_text = p.get_text()
-                        p_text = ' '.join(p_text.split())
-                        if p_text:
-                            all_paragraphs.append(p_text)
-                    body = '\n\n'.join(all_paragraphs)
-                    h_tag = section.find(['h1', 'h2', 'h3'])
-                    if h_tag and not title:
-                        title = h_tag.get_text(strip=True)
-                    break
+    # Strategy 2: Fallback to broader search if specific selectors fail,
+    # skipped outright when the byline appears nowhere in the raw page
+    if not body and _ITOI_BYLINE_BYTES in html:
+        section = find_essay_section(tree)
+        if section:
+            body = join_paragraphs(section)
+            h_tag = section.css_first('h1, h2, h3')
+            if h_tag and not title:
+                title = h_tag.text(strip=True)
+
+    return title, author, body
+
+
+def scrape_essay(html: Optional[bytes]) -> tuple:
+    """Extract Itoi's daily essay from the fetched 1101.com homepage.
+
+    The essay is server-rendered, so the plain fetch is parsed first;
+    Playwright is only launched if that page is missing or yields no essay.
+    Returns (essay, rendered), where essay is None if nothing was found and
+    rendered says whether Playwright was needed.
+    """
+    title, author, body = None, None, None
+    rendered = False
+
+    if html:
+        title, author, body = parse_essay(html)
+
+    if not body or len(body) < 200:
+        print("Essay not found in static HTML, rendering with Playwright...")
+        title, author, body = parse_essay(render_html())
+        rendered = True
 
     if not body or len(body) < 200:
         print("Could not extract essay content")
-        return None
+        return None, rendered
 
-    # Clean up the essay text while preserving paragraph breaks
-    paragraphs = body.split('\n\n')
-    cleaned_paragraphs = []
-    seen_paragraphs = set()
-    for para in paragraphs:
-        # Clean within paragraph (handle any single newlines)
-        para_lines = para.split('\n')
-        cleaned_para_lines = []
-        for line in para_lines:
-            # Skip footer lines about update times
-            if 'ほぼ日の更新時間' in line:
-                continue
-            cleaned_para_lines.append(line)
-        para = '\n'.join(cleaned_para_lines).strip()
-
-        if not para:
-            continue
-        # Skip duplicate paragraphs
-        if para in seen_paragraphs:
-            continue
-        seen_paragraphs.add(para)
-        cleaned_paragraphs.append(para)
-    body = '\n\n'.join(cleaned_paragraphs).strip()
-
-    # Generate a hash to detect duplicate content
-    content_hash = hashlib.md5(body.encode()).hexdigest()[:12]
-
-    return {
+    # Hash the extracted text before cleanup so a known essay can be skipped
+    # without cleaning it, and ids stay stable if the cleanup rules change
+    content_hash = hashlib.blake2b(body.encode(), digest_size=6).hexdigest()
+
+    # The body is cleaned later, by clean_body(), once the essay is known to be new
+    essay = {
         'title': title or f"今日のダーリン - {datetime.now().strftime('%Y年%m月%d日')}",
-        'author': author or "糸井重里",
+        'author': author or ITOI_BYLINE,
         'body': body,
         'date': datetime.now(timezone.utc).isoformat(),
         'hash': content_hash,
     }
+    return essay, rendered
 
 
-def translate_text(japanese_text: str, is_title: bool = False) -> str:
-    """Translate text using Claude API."""
-    api_key = os.environ.get('ANTHROPIC_API_KEY')
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+def clean_body(body: str) -> str:
+    """Clean up scraped essay text while preserving paragraph breaks.
 
-    client = Anthropic(api_key=api_key)
+    Drops footer lines about update times, then empty and duplicate paragraphs.
+    """
+    # A plain substring test is cheaper than running the line regex for nothing
+    if FOOTER_MARKER in body:
+        body = _FOOTER_LINE_RE.sub('', body)
+    paragraphs = (para.strip() for para in body.split('\n\n'))
+    return '\n\n'.join(dict.fromkeys(filter(None, paragraphs)))
 
-    if is_title:
-        prompt = f"""Translate this Japanese essay title into natural English.
-Output only the translated title, nothing else.
 
-{japanese_text}"""
-    else:
-        # Count paragraphs to tell Claude exactly how many <p> tags to output
-        paragraph_count = len([p for p in japanese_text.split('\n\n') if p.strip()])
-        prompt = f"""Translate this Japanese personal essay into natural, literary English.
+@_claude_retry
+def translate_essay(title: str, author: str, body: str) -> dict:
+    """Translate and summarize the essay's title, author, and body in one Claude API call.
+
+    Returns a dict with translated_title, translated_author, translation, and summary.
+    """
+    client = _client()
+
+    # Count paragraphs to tell Claude exactly how many <p> tags to output
+    paragraph_count = len([p for p in body.split('\n\n') if p.strip()])
+    prompt = f"""Translate this Japanese personal essay, its title, and its author's name into natural, literary English.
 Preserve the author's voice and tone. Do not include boilerplate or explanations.
 
-The input has {paragraph_count} paragraphs. Output exactly {paragraph_count} <p> tags, one per paragraph.
+The essay has {paragraph_count} paragraphs. Translate it as exactly {paragraph_count} <p> tags, one per paragraph.
 
 Format:
 <p>First paragraph translation here.</p>
@@ -193,227 +395,270 @@ Format:
 
 Rules:
 - One paragraph = one <p> tag (do not split or combine paragraphs)
-- Output ONLY the <p> tags, no other markup or text
+- The essay translation is ONLY the <p> tags, no other markup or text
 - Render "ほぼ日刊イトイ新聞" or "ほぼ日" as "Hobonichi"
 
-{japanese_text}"""
+Also create a brief 1-2 sentence summary of the essay that captures its main theme or insight.
+Be concise and natural.
+
+<title>{title}</title>
+<author>{author}</author>
+<essay>
+{body}
+</essay>"""
 
     message = client.messages.create(
         model="claude-sonnet-4-20250514",
-        max_tokens=4000,
+        max_tokens=TRANSLATION_MAX_TOKENS,
+        tools=[TRANSLATION_TOOL],
+        tool_choice={"type": "tool", "name": TRANSLATION_TOOL['name']},
         messages=[{"role": "user", "content": prompt}]
     )
 
-    return message.content[0].text
+    # A reply cut off at max_tokens carries a partial or empty tool input
+    if message.stop_reason == 'max_tokens':
+        raise RuntimeError(f"Translation was cut off at max_tokens={TRANSLATION_MAX_TOKENS}")
+    translated = next((block.input for block in message.content if block.type == 'tool_use'), None)
+    if translated is None:
+        raise RuntimeError(f"Claude did not call {TRANSLATION_TOOL['name']} (stop_reason: {message.stop_reason})")
+    return {key: value.strip() for key, value in translated.items()}
 
 
-def summarize_translation(translation: str) -> str:
-    """Generate a 1-2 line summary from the translated essay."""
-    api_key = os.environ.get('ANTHROPIC_API_KEY')
-    if not api_key:
-        raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+def write_atomic(path: Path, data: bytes):
+    """Write a file so that it is never left truncated.
 
-    client = Anthropic(api_key=api_key)
+    The data goes to a temp file next to the target, is fsynced, and then
+    renamed over the target, so a run killed mid-write leaves the old
+    file intact.
+    """
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
-    prompt = f"""Create a brief 1-2 sentence summary of this essay that captures its main theme or insight.
-Be concise and natural. Output only the summary, nothing else.
 
-{translation}"""
+def append_atomic(path: Path, data: bytes):
+    """Append to a file, rewriting it atomically with write_atomic()."""
+    existing = path.read_bytes() if path.exists() else b''
+    write_atomic(path, existing + data)
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=200,
-        messages=[{"role": "user", "content": prompt}]
-    )
 
-    return message.content[0].text.strip()
+def load_archive(limit: Optional[int] = None) -> list:
+    """Load existing archive of essays, most recent first.
 
-
-def load_archive() -> list:
-    """Load existing archive of essays."""
+    If limit is given, only the newest `limit` entries are parsed.
+    """
     if ARCHIVE_FILE.exists():
-        with open(ARCHIVE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        lines = [line for line in ARCHIVE_FILE.read_bytes().splitlines() if line]
+        if limit is not None:
+            lines = lines[-limit:]
+        archive = [orjson.loads(line) for line in reversed(lines)]
+        # Author names repeat in almost every entry; share one str object each
+        for entry in archive:
+            for field in INTERNED_FIELDS:
+                if isinstance(entry.get(field), str):
+                    entry[field] = sys.intern(entry[field])
+        return archive
     return []
 
 
-def save_archive(archive: list):
-    """Save archive to disk."""
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    with open(ARCHIVE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(archive, f, ensure_ascii=False, indent=2)
+def append_archive(essay: dict):
+    """Append a new essay to the archive.
+
+    The archive is JSON Lines, oldest first, so adding an essay serializes
+    only that entry; the earlier lines are copied as bytes. Only the newest
+    ARCHIVE_LIMIT entries are kept; older ones move to yearly shards.
+    """
+    existing = ARCHIVE_FILE.read_bytes() if ARCHIVE_FILE.exists() else b''
+    lines = [line for line in existing.splitlines() if line]
+    lines.append(orjson.dumps(essay))
+
+    if len(lines) > ARCHIVE_LIMIT:
+        spill_archive(lines[:-ARCHIVE_LIMIT])
+        lines = lines[-ARCHIVE_LIMIT:]
+    write_atomic(ARCHIVE_FILE, b''.join(line + b'\n' for line in lines))
+
+
+def spill_archive(lines: list):
+    """Append serialized archive entries to their yearly archive-YYYY.jsonl shard."""
+    by_year = {}
+    for line in lines:
+        year = orjson.loads(line)['date'][:4]
+        by_year.setdefault(year, []).append(line)
+
+    for year, year_lines in by_year.items():
+        append_atomic(OUTPUT_DIR / f"archive-{year}.jsonl", b''.join(line + b'\n' for line in year_lines))
+
+
+def load_hashes() -> set:
+    """Load the content hashes of every archived essay."""
+    if HASHES_FILE.exists():
+        return set(HASHES_FILE.read_text(encoding='utf-8').split())
+    return set(iter_archive_hashes())
+
+
+def iter_archive_hashes():
+    """Yield archived essays' hashes one line at a time, without keeping the entries.
+
+    Covers the yearly archive-YYYY.jsonl shards as well as archive.jsonl.
+    """
+    paths = sorted(OUTPUT_DIR.glob('archive-*.jsonl'))
+    if ARCHIVE_FILE.exists():
+        paths.append(ARCHIVE_FILE)
+    for path in paths:
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)['hash']
+
+
+def append_hash(content_hash: str, known_hashes: set):
+    """Record a newly archived essay's content hash.
+
+    If the sidecar is missing, it is written out with every hash from
+    load_hashes() as well, so the older essays stay deduplicated.
+    """
+    if HASHES_FILE.exists():
+        append_atomic(HASHES_FILE, content_hash.encode() + b'\n')
+    else:
+        write_atomic(HASHES_FILE, ''.join(h + '\n' for h in sorted(known_hashes | {content_hash})).encode())
+
+
+def add_atom_entry(feed, entry_data: dict):
+    """Append an Atom <entry> for an archived essay to the feed element."""
+    # SubElement picks up the feed's namespace declarations
+    entry = etree.SubElement(feed, ATOM + 'entry')
+    etree.SubElement(entry, ATOM + 'id').text = f"https://adtheriault.github.io/itoi-daily/#{entry_data['hash']}"
+    etree.SubElement(entry, ATOM + 'title').text = entry_data.get('translated_title', entry_data['title'])
+    etree.SubElement(entry, ATOM + 'updated').text = entry_data['date']
+    author = etree.SubElement(entry, ATOM + 'author')
+    etree.SubElement(author, ATOM + 'name').text = entry_data.get('translated_author', entry_data.get('author', 'Shigesato Itoi'))
+    etree.SubElement(entry, ATOM + 'content', type='html').text = IMAGE_HTML + entry_data['translation']
+    etree.SubElement(entry, ATOM + 'link', href='https://www.1101.com/', rel='alternate', type='text/html')
+    etree.SubElement(entry, ATOM + 'summary').text = entry_data.get('summary', '')
+    etree.SubElement(entry, ATOM + 'published').text = entry_data['date']
+    etree.SubElement(entry, MEDIA + 'thumbnail', url=DARLING_IMAGE_URL, width='200', height='200')
+    return entry
+
+
+def write_atom(feed):
+    """Serialize the feed element to FEED_FILE."""
+    etree.indent(feed, space='  ')
+    write_atomic(FEED_FILE, etree.tostring(feed, xml_declaration=True, encoding='UTF-8', pretty_print=True))
 
 
 def generate_atom(archive: list):
-    """Generate Atom feed from archive."""
-    fg = FeedGenerator()
-    fg.id('https://adtheriault.github.io/itoi-daily/feed.xml')
-    fg.title("Today's Darling")
-    fg.subtitle('Daily essays by Shigesato Itoi from 1101.com, translated to English.')
-    fg.link(href='https://www.1101.com/', rel='alternate', type='text/html')
-    fg.link(href='https://adtheriault.github.io/itoi-daily/feed.xml', rel='self', type='application/atom+xml')
-    fg.language('en')
-    fg.icon(HOBONICHI_ICON_URL)
-
-    # Add entries (most recent first, limit to 30)
-    for entry_data in archive[:30]:
-        fe = fg.add_entry()
-        fe.id(f"https://adtheriault.github.io/itoi-daily/#{entry_data['hash']}")
-        fe.title(entry_data.get('translated_title', entry_data['title']))
-        fe.author({'name': entry_data.get('translated_author', entry_data.get('author', 'Shigesato Itoi'))})
-        fe.link(href='https://www.1101.com/', rel='alternate', type='text/html')
-
-        # Use summary for description (1-2 line summary)
-        summary = entry_data.get('summary', '')
-        fe.summary(summary)
-
-        # Add full translation as content with centered header image
-        translation = entry_data['translation']
-        # Prepend a centered image at the top of the content
-        image_html = f'<div style="text-align: center; margin-bottom: 20px;"><img src="{DARLING_IMAGE_URL}" alt="Hobonichi Darling" style="max-width: 300px; height: auto;"/></div>'
-        content_with_image = image_html + translation
-        fe.content(content=content_with_image, type='html')
-
-        fe.published(entry_data['date'])
-        fe.updated(entry_data['date'])
-
-    OUTPUT_DIR.mkdir(exist_ok=True)
-    fg.atom_file(str(FEED_FILE), pretty=True)
-
-    # Post-process to match the desired header format
-    with open(FEED_FILE, 'r', encoding='utf-8') as f:
-        xml_content = f.read()
-
-    # Add thr and media namespaces if not present
-    if 'xmlns:media=' not in xml_content:
-        xml_content = xml_content.replace(
-            '<feed xmlns="http://www.w3.org/2005/Atom"',
-            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/" xmlns:thr="http://purl.org/syndication/thread/1.0"',
-            1
-        )
-    elif 'xmlns:thr=' not in xml_content:
-        xml_content = xml_content.replace(
-            '<feed xmlns="http://www.w3.org/2005/Atom"',
-            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:thr="http://purl.org/syndication/thread/1.0"',
-            1
-        )
-
-    # Add type="text" to title element
-    if '<title type=' not in xml_content:
-        xml_content = xml_content.replace(
-            '<title>',
-            '<title type="text">',
-            1
-        )
-
-    # Reorder feed header elements to match convention:
-    # title, subtitle, updated, link(alternate), id, link(self), icon
-    import re
-    feed_match = re.search(r'<feed[^>]*>.*?(?=<entry|</feed>)', xml_content, re.DOTALL)
-    if feed_match:
-        feed_section = feed_match.group(0)
-
-        # Extract individual elements
-        title_match = re.search(r'(<title[^>]*>.*?</title>)', feed_section)
-        subtitle_match = re.search(r'(<subtitle>.*?</subtitle>)', feed_section)
-        updated_match = re.search(r'(<updated>.*?</updated>)', feed_section)
-        links = re.findall(r'(<link[^>]*/?>)', feed_section)
-        id_match = re.search(r'(<id>.*?</id>)', feed_section)
-        icon_match = re.search(r'(<icon>.*?</icon>)', feed_section)
-        generator_match = re.search(r'(<generator[^>]*>.*?</generator>)', feed_section)
-
-        # Reconstruct in desired order with all namespaces
-        new_feed = '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/" xmlns:thr="http://purl.org/syndication/thread/1.0" xml:lang="en">\n'
-        if title_match:
-            new_feed += '  ' + title_match.group(1) + '\n'
-        if subtitle_match:
-            new_feed += '  ' + subtitle_match.group(1) + '\n'
-        if updated_match:
-            new_feed += '  ' + updated_match.group(1) + '\n'
-        # Add links in order: alternate first, then self
-        for link in links:
-            if 'rel="alternate"' in link:
-                new_feed += '  ' + link + '\n'
-        if id_match:
-            new_feed += '  ' + id_match.group(1) + '\n'
-        for link in links:
-            if 'rel="self"' in link:
-                new_feed += '  ' + link + '\n'
-        if icon_match:
-            new_feed += '  ' + icon_match.group(1) + '\n'
-
-        # Replace the feed opening with our reconstructed one
-        xml_content = new_feed + xml_content[feed_match.end():]
-
-    # Add media:thumbnail to each entry
-    for entry_data in archive[:30]:
-        guid = entry_data['hash']
-        entry_id_pattern = f'<id>https://adtheriault.github.io/itoi-daily/#{guid}</id>'
-        if entry_id_pattern in xml_content:
-            # Add thumbnail after the published element
-            thumbnail_tag = f'<media:thumbnail url="{DARLING_IMAGE_URL}" width="200" height="200"/>'
-            published_pattern = '</published>'
-            # Find the published tag that comes after this entry's id
-            entry_start = xml_content.find(entry_id_pattern)
-            if entry_start != -1:
-                # Find the next </published> after this entry
-                published_end = xml_content.find(published_pattern, entry_start)
-                if published_end != -1:
-                    insertion_point = published_end + len(published_pattern)
-                    # Check if thumbnail already exists for this entry
-                    check_range = xml_content[entry_start:entry_start + 1500]
-                    if f'<media:thumbnail' not in check_range:
-                        xml_content = xml_content[:insertion_point] + '\n  ' + thumbnail_tag + xml_content[insertion_point:]
-
-    # Write final XML
-    with open(FEED_FILE, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
+    """Generate Atom feed from archive.
+
+    The tree is built in its final shape (namespaces, header order, and
+    per-entry thumbnails) and serialized once.
+    """
+    feed = etree.Element(ATOM + 'feed', nsmap=FEED_NSMAP)
+    feed.set('{http://www.w3.org/XML/1998/namespace}lang', 'en')
+
+    # Header order: title, subtitle, updated, link(alternate), id, link(self), icon
+    etree.SubElement(feed, ATOM + 'title', type='text').text = "Today's Darling"
+    etree.SubElement(feed, ATOM + 'subtitle').text = 'Daily essays by Shigesato Itoi from 1101.com, translated to English.'
+    etree.SubElement(feed, ATOM + 'updated').text = datetime.now(timezone.utc).isoformat()
+    etree.SubElement(feed, ATOM + 'link', href='https://www.1101.com/', rel='alternate', type='text/html')
+    etree.SubElement(feed, ATOM + 'id').text = 'https://adtheriault.github.io/itoi-daily/feed.xml'
+    etree.SubElement(feed, ATOM + 'link', href='https://adtheriault.github.io/itoi-daily/feed.xml', rel='self', type='application/atom+xml')
+    etree.SubElement(feed, ATOM + 'icon').text = HOBONICHI_ICON_URL
+
+    # Add entries (most recent first)
+    for entry_data in archive[:FEED_LIMIT]:
+        add_atom_entry(feed, entry_data)
+
+    write_atom(feed)
+
+
+def update_atom(essay: dict):
+    """Add a new essay to the existing Atom feed.
+
+    The previously written feed serves as the cache of rendered entries: it is
+    parsed once, the new entry is prepended, entries past FEED_LIMIT are
+    dropped, and the tree is serialized. Falls back to a full generate_atom()
+    if there is no usable feed yet.
+    """
+    try:
+        feed = etree.parse(str(FEED_FILE), etree.XMLParser(remove_blank_text=True)).getroot()
+    except (OSError, etree.XMLSyntaxError):
+        generate_atom(load_archive(limit=FEED_LIMIT))
+        return
+
+    feed.find(ATOM + 'updated').text = datetime.now(timezone.utc).isoformat()
+    entry = add_atom_entry(feed, essay)
+
+    # Move the new entry ahead of the existing ones (most recent first)
+    older_entries = feed.findall(ATOM + 'entry')[:-1]
+    if older_entries:
+        older_entries[0].addprevious(entry)
+    for old_entry in older_entries[FEED_LIMIT - 1:]:
+        feed.remove(old_entry)
+
+    write_atom(feed)
+
+
+def essay_day(when: datetime) -> date:
+    """Return the date of the essay that is live on 1101.com at a given moment.
+
+    A new essay goes up at 11 AM JST, so the essay "day" starts then rather
+    than at midnight.
+    """
+    return (when.astimezone(JST) - timedelta(hours=ESSAY_UPDATE_HOUR)).date()
 
 
 def main():
     print(f"Starting scrape at {datetime.now().isoformat()}")
 
-    # Scrape today's essay
-    essay = scrape_essay()
+    # Skip the scrape entirely if today's essay has already been archived
+    latest = load_archive(limit=1)
+    now = datetime.now(timezone.utc)
+    if latest and essay_day(datetime.fromisoformat(latest[0]['date'])) == essay_day(now):
+        print(f"Already archived the essay for {essay_day(now)}, exiting")
+        return
+
+    # Skip parsing and rendering if the homepage is unchanged since the last
+    # processed run
+    response = fetch_homepage(load_validators())
+    if response is not None and response.status_code == 304:
+        print("Homepage unchanged since the last run, exiting")
+        return
+
+    # Scrape today's essay (Lexbor decodes the raw UTF-8 bytes itself)
+    essay, rendered = scrape_essay(response.content if response is not None else None)
     if not essay:
         print("No essay found, exiting")
         return
 
-    # Check if we already have this essay
-    archive = load_archive()
-    existing_hashes = {e['hash'] for e in archive}
+    # Only a homepage whose own HTML held the essay is safe to fetch conditionally
+    static_response = None if rendered else response
 
-    if essay['hash'] in existing_hashes:
+    # Check if we already have this essay (without parsing the archive itself)
+    known_hashes = load_hashes()
+    if essay['hash'] in known_hashes:
         print(f"Essay already in archive (hash: {essay['hash']}), skipping")
+        save_validators(static_response)
         return
 
-    # Translate title, author, and body
-    print("Translating title...")
-    translated_title = translate_text(essay['title'], is_title=True).strip()
-
-    print("Translating author...")
-    translated_author = translate_text(essay['author'], is_title=True).strip()
-
-    print("Translating essay...")
-    translation = translate_text(essay['body'])
-
-    print("Generating summary...")
-    summary = summarize_translation(translation)
+    essay['body'] = clean_body(essay['body'])
 
-    # Add to archive
-    essay['translation'] = translation
-    essay['summary'] = summary
-    essay['translated_title'] = translated_title
-    essay['translated_author'] = translated_author
-    archive.insert(0, essay)  # Most recent first
+    # Translate title, author, and body and summarize them in one call
+    print("Translating and summarizing essay...")
+    essay.update(translate_essay(essay['title'], essay['author'], essay['body']))
 
     # Save and regenerate feed
-    save_archive(archive)
-    generate_atom(archive)
+    append_archive(essay)
+    append_hash(essay['hash'], known_hashes)
+    update_atom(essay)
+    save_validators(static_response)
 
     print(f"Successfully processed: {essay['title']}")
-    print(f"Translated title: {translated_title}")
-    print(f"Summary: {summary}")
+    print(f"Translated title: {essay['translated_title']}")
+    print(f"Summary: {essay['summary']}")
 
 
 if __name__ == "__main__":